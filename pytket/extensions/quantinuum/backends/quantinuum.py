@@ -15,12 +15,15 @@
 
 from ast import literal_eval
 from base64 import b64encode
+from copy import deepcopy
 from dataclasses import dataclass
 from enum import Enum
 import json
 from http import HTTPStatus
 from typing import Dict, List, Set, Optional, Sequence, Union, Any, cast, Tuple
+import time
 import warnings
+from weakref import WeakKeyDictionary
 
 import numpy as np
 import requests
@@ -78,6 +81,9 @@ from .api_wrappers import QuantinuumAPIError, QuantinuumAPI
 _DEBUG_HANDLE_PREFIX = "_MACHINE_DEBUG_"
 MAX_C_REG_WIDTH = 32
 
+# Time in seconds for which the device information fetched from the API is reused
+_DEVICE_CACHE_TIMEOUT = 60.0
+
 _STATUS_MAP = {
     "queued": StatusEnum.QUEUED,
     "running": StatusEnum.RUNNING,
@@ -197,6 +203,12 @@ class QuantinuumBackend(Backend):
     _supports_contextual_optimisation = True
     _persistent_handles = True
 
+    # Device information fetched by _available_devices, per API handler, with the
+    # time at which it expires and the id token it was fetched with.
+    _device_cache: "WeakKeyDictionary[QuantinuumAPI, Tuple[float, str, List[Dict]]]" = (
+        WeakKeyDictionary()
+    )
+
     def __init__(
         self,
         device_name: str,
@@ -255,6 +267,10 @@ class QuantinuumBackend(Backend):
     ) -> List[Dict[str, Any]]:
         """List devices available from Quantinuum.
 
+        For an online handler, the list is cached for `_DEVICE_CACHE_TIMEOUT`
+        seconds, and a cached list is returned without calling `login()` as long as
+        the handler still holds the id token it was fetched with.
+
         >>> QuantinuumBackend._available_devices()
         e.g. [{'name': 'H1', 'n_qubits': 6}]
 
@@ -263,18 +279,40 @@ class QuantinuumBackend(Backend):
         :return: Dictionaries of machine name and number of qubits.
         :rtype: List[Dict[str, Any]]
         """
-        id_token = api_handler.login()
         if api_handler.online:
+            cached = cls._device_cache.get(api_handler)
+            if (
+                cached is not None
+                and time.monotonic() < cached[0]
+                and api_handler._cred_store.id_token == cached[1]
+            ):
+                return deepcopy(cached[2])
+            id_token = api_handler.login()
             res = requests.get(
                 f"{api_handler.url}machine/?config=true",
                 headers={"Authorization": id_token},
             )
             api_handler._response_check(res, "get machine list")
             jr = res.json()
+            cls._device_cache[api_handler] = (
+                time.monotonic() + _DEVICE_CACHE_TIMEOUT,
+                id_token,
+                deepcopy(jr),
+            )
         else:
             jr = api_handler._get_machine_list()  # type: ignore
         return jr  # type: ignore
 
+    @classmethod
+    def clear_device_cache(cls) -> None:
+        """Discard the device information cached from previous requests.
+
+        The list of devices fetched from the Quantinuum API is reused for a minute
+        by the backends sharing the same API handler. After calling this method it
+        is requested again the next time it is needed.
+        """
+        cls._device_cache.clear()
+
     @classmethod
     def _dict_to_backendinfo(cls, dct: Dict[str, Any]) -> BackendInfo:
         name: str = dct.pop("name")
@@ -303,6 +341,12 @@ class QuantinuumBackend(Backend):
     ) -> List[BackendInfo]:
         """
         See :py:meth:`pytket.backends.Backend.available_devices`.
+
+        The device list returned by the Quantinuum API is cached per API handler
+        for 60 seconds, during which it is returned without logging in or making a
+        request, unless the handler's credentials have changed. Call
+        :py:meth:`clear_device_cache` first to get the current list.
+
         :param api_handler: Instance of API handler, defaults to DEFAULT_API_HANDLER
         :type api_handler: Optional[QuantinuumAPI]
         """
@@ -617,51 +661,28 @@ class QuantinuumBackend(Backend):
 
         handle_list = []
 
+        # Programs for the circuits converted so far, keyed by circuit identity, so
+        # that a circuit submitted several times in this call is only converted once.
+        converted: Dict[int, Tuple[str, Optional[Dict[str, Any]]]] = {}
+
         max_shots = self.backend_info.misc.get("n_shots") if self.backend_info else None
         for circ, n_shots in zip(circuits, n_shots_list):
             if max_shots is not None and n_shots > max_shots:
                 raise MaxShotsExceeded(
                     f"Number of shots {n_shots} exceeds maximum {max_shots}"
                 )
-            if postprocess:
-                c0, ppcirc = prepare_circuit(circ, allow_classical=False, xcirc=_xcirc)
-                ppcirc_rep = ppcirc.to_dict()
-            else:
-                c0, ppcirc_rep = circ, None
-            if language == Language.QASM:
-                quantinuum_circ = circuit_to_qasm_str(c0, header="hqslib1")
+            if id(circ) in converted:
+                quantinuum_circ, ppcirc_rep = converted[id(circ)]
             else:
-                assert language == Language.QIR
-                warnings.warn(
-                    "Support for Language.QIR is experimental; this may fail!"
-                )
-                try:
-                    pytket_qir_version_components = list(
-                        map(int, pytket_qir_version.split(".")[:2])
-                    )
-                    if (
-                        pytket_qir_version_components[0] == 0
-                        and pytket_qir_version_components[1] < 2
-                    ):
-                        raise RuntimeError(
-                            "Please install `pytket-qir` version 0.2 or above."
-                        )
-                    quantinuum_circ = b64encode(
-                        cast(
-                            bytes,
-                            pytket_to_qir(
-                                c0,
-                                "circuit generated by pytket-qir",
-                                QIRFormat.BINARY,
-                                True,
-                            ),
-                        )
-                    ).decode("utf-8")
-                except NameError:
-                    raise RuntimeError(
-                        "You must install the `pytket-qir` package in order to use QIR "
-                        "submission."
+                if postprocess:
+                    c0, ppcirc = prepare_circuit(
+                        circ, allow_classical=False, xcirc=_xcirc
                     )
+                    ppcirc_rep = ppcirc.to_dict()
+                else:
+                    c0, ppcirc_rep = circ, None
+                quantinuum_circ = _circuit_to_program(c0, language)
+                converted[id(circ)] = (quantinuum_circ, ppcirc_rep)
 
             if self._MACHINE_DEBUG:
                 handle_list.append(
@@ -994,6 +1015,38 @@ _xcirc = Circuit(1).add_gate(OpType.PhasedX, [1, 0], [0])
 _xcirc.add_phase(0.5)
 
 
+def _circuit_to_program(circ: Circuit, language: Language) -> str:
+    if language == Language.QASM:
+        return circuit_to_qasm_str(circ, header="hqslib1")
+    assert language == Language.QIR
+    warnings.warn("Support for Language.QIR is experimental; this may fail!")
+    try:
+        pytket_qir_version_components = list(
+            map(int, pytket_qir_version.split(".")[:2])
+        )
+        if (
+            pytket_qir_version_components[0] == 0
+            and pytket_qir_version_components[1] < 2
+        ):
+            raise RuntimeError("Please install `pytket-qir` version 0.2 or above.")
+        return b64encode(
+            cast(
+                bytes,
+                pytket_to_qir(
+                    circ,
+                    "circuit generated by pytket-qir",
+                    QIRFormat.BINARY,
+                    True,
+                ),
+            )
+        ).decode("utf-8")
+    except NameError:
+        raise RuntimeError(
+            "You must install the `pytket-qir` package in order to use QIR "
+            "submission."
+        )
+
+
 def _convert_result(
     resultdict: Dict[str, List[str]], ppcirc: Optional[Circuit] = None
 ) -> BackendResult:
@@ -34,6 +34,7 @@ from pytket.passes import (  # type: ignore
     OptimisePhaseGadgets,
 )
 from pytket.predicates import CompilationUnit  # type: ignore
+from pytket.qasm import circuit_to_qasm_str
 
 from pytket.circuit import (  # type: ignore
     Circuit,
@@ -50,6 +51,7 @@ from pytket.circuit import (  # type: ignore
     if_not_bit,
 )
 from pytket.extensions.quantinuum import QuantinuumBackend, Language
+from pytket.extensions.quantinuum.backends import quantinuum
 from pytket.extensions.quantinuum.backends.quantinuum import (
     GetResultFailed,
     _GATE_SET,
@@ -169,6 +171,42 @@ def test_quantinuum_offline() -> None:
     # assert result[0]["options"] == expected_result["options"]
 
 
+def test_quantinuum_offline_repeated_circuit(monkeypatch: pytest.MonkeyPatch) -> None:
+    conversions: Counter[str] = Counter()
+    circuit_to_program = quantinuum._circuit_to_program
+
+    def counting_circuit_to_program(circ: Circuit, language: Language) -> str:
+        conversions[circ.name] += 1
+        return circuit_to_program(circ, language)
+
+    monkeypatch.setattr(quantinuum, "_circuit_to_program", counting_circuit_to_program)
+
+    qapioffline = QuantinuumAPIOffline()
+    backend = QuantinuumBackend(
+        device_name="H1-1", machine_debug=False, api_handler=qapioffline  # type: ignore
+    )
+    c = Circuit(2, 2, "test 2").H(0).CX(0, 1).measure_all()
+    c = backend.get_compiled_circuit(c)
+    _ = backend.process_circuits([c, c, c], [4, 5, 6])
+    result = qapioffline.get_jobs()
+    assert result is not None
+    assert [job["count"] for job in result] == [4, 5, 6]
+    assert result[0]["program"] == circuit_to_qasm_str(c, header="hqslib1")
+    assert all(job["program"] == result[0]["program"] for job in result)
+    assert sum(conversions.values()) == 1
+
+    # A different circuit in between is converted separately
+    conversions.clear()
+    c2 = Circuit(2, 2, "test 3").X(0).measure_all()
+    c2 = backend.get_compiled_circuit(c2)
+    _ = backend.process_circuits([c, c2, c], 10)
+    assert conversions == {"test 2": 1, "test 3": 1}
+    result = qapioffline.get_jobs()
+    assert result is not None
+    programs = [job["program"] for job in result[-3:]]
+    assert programs[0] == programs[2] != programs[1]
+
+
 @pytest.mark.skipif(skip_remote_tests, reason=REASON)
 @pytest.mark.parametrize(
     "authenticated_quum_backend", [{"device_name": "H1-1SC"}], indirect=True
@@ -13,15 +13,25 @@
 # limitations under the License.
 
 import os
-from typing import Any, Dict, List, Tuple, Optional
+import json
+import re
+from copy import deepcopy
+from http import HTTPStatus
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, NamedTuple, Tuple, Optional
+from urllib.parse import urlparse
 
 import pytest
 from _pytest.fixtures import SubRequest
+import requests
 from requests_mock.mocker import Mocker
+from requests_mock import ANY
 import jwt
 
+from pytket.circuit import Circuit  # type: ignore
 from pytket.extensions.quantinuum import QuantinuumBackend
 from pytket.extensions.quantinuum.backends.api_wrappers import QuantinuumAPI
+from pytket.extensions.quantinuum.backends.quantinuum import DEFAULT_API_HANDLER
 from pytket.extensions.quantinuum.backends.credential_storage import (
     MemoryCredentialStorage,
 )
@@ -29,6 +39,89 @@ from pytket.extensions.quantinuum.backends.credential_storage import (
 
 skip_remote_tests: bool = os.getenv("PYTKET_RUN_REMOTE_TESTS") is None
 
+LOGIN_URL = "https://qapi.quantinuum.com/v1/login"
+JSON_HDR = {"Content-Type": "application/json"}
+
+# A mock token that expires in 2073
+_MOCK_TOKEN = str(jwt.encode({"exp": 3278815149.143694}, key="", algorithm="HS256"))
+
+_MOCK_MACHINE_INFO = {
+    "name": "H9-27",
+    "n_qubits": 12,
+    "gateset": [],
+    "n_classical_registers": 120,
+    "n_shots": 10000,
+    "system_type": "hardware",
+    "emulator": "H9-27E",
+    "syntax_checker": "H9-27SC",
+    "batching": True,
+    "wasm": True,
+}
+
+_MOCK_JOB_ID = "abc-123"
+
+_QAPI_URL_PATTERN = re.compile(r"https://qapi\.quantinuum\.com/v1/.*")
+
+
+class _MockRoute(NamedTuple):
+    method: str
+    path: str
+    body: Any
+
+
+# Quantinuum API endpoints served by the api_routes and fast_http fixtures
+_MOCKED_ROUTES = {
+    "login": _MockRoute(
+        "POST", "/v1/login", {"id-token": _MOCK_TOKEN, "refresh-token": _MOCK_TOKEN}
+    ),
+    "job": _MockRoute("POST", "/v1/job", {"job": _MOCK_JOB_ID}),
+    "status": _MockRoute("GET", f"/v1/job/{_MOCK_JOB_ID}", {"job": _MOCK_JOB_ID}),
+    "machine": _MockRoute("GET", "/v1/machine/", [_MOCK_MACHINE_INFO]),
+}
+
+# Route names by method and path
+_ROUTE_NAMES = {
+    (route.method, route.path): name for name, route in _MOCKED_ROUTES.items()
+}
+
+
+def _route_name(request: requests.PreparedRequest) -> Optional[str]:
+    return _ROUTE_NAMES.get((str(request.method), urlparse(str(request.url)).path))
+
+
+def _json_response(body: Any) -> requests.Response:
+    response = requests.Response()
+    response.status_code = HTTPStatus.OK
+    response.headers.update(JSON_HDR)
+    response._content = json.dumps(body).encode()
+    return response
+
+
+# Responses served by the fast_http fixture, built once from the route table.
+# Job status is left out, so that an unexpected status poll fails the test.
+_FAST_HTTP_RESPONSES = {
+    name: _json_response(route.body)
+    for name, route in _MOCKED_ROUTES.items()
+    if name != "status"
+}
+
+
+class CapturingRoute:
+    """Counts the requests made to a mocked endpoint and keeps the JSON body of
+    the last one, instead of recording the full request history."""
+
+    def __init__(self) -> None:
+        self.call_count = 0
+        self.last_json: Any = None
+
+    @property
+    def called_once(self) -> bool:
+        return self.call_count == 1
+
+    def capture(self, request: requests.PreparedRequest) -> None:
+        self.call_count += 1
+        self.last_json = json.loads(request.body) if request.body else None
+
 
 def pytest_make_parametrize_id(
     config: pytest.Config, val: object, argname: str
@@ -41,6 +134,13 @@ def pytest_make_parametrize_id(
     return None
 
 
+@pytest.fixture(autouse=True)
+def clear_device_cache() -> None:
+    """Make each test fetch the device information afresh, since the machine list
+    served by the mocked API differs between tests."""
+    QuantinuumBackend.clear_device_cache()
+
+
 @pytest.fixture()
 def mock_credentials() -> Tuple[str, str]:
     username = "mark.quantinuum@mail.com"
@@ -48,12 +148,9 @@ def mock_credentials() -> Tuple[str, str]:
     return (username, pwd)
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def mock_token() -> str:
-    # A mock token that expires in 2073
-    token_payload = {"exp": 3278815149.143694}
-    mock_token = jwt.encode(token_payload, key="", algorithm="HS256")
-    return str(mock_token)
+    return _MOCK_TOKEN
 
 
 @pytest.fixture()
@@ -68,18 +165,7 @@ def mock_ms_provider_token() -> str:
 
 @pytest.fixture()
 def mock_machine_info() -> Dict[str, Any]:
-    return {
-        "name": "H9-27",
-        "n_qubits": 12,
-        "gateset": [],
-        "n_classical_registers": 120,
-        "n_shots": 10000,
-        "system_type": "hardware",
-        "emulator": "H9-27E",
-        "syntax_checker": "H9-27SC",
-        "batching": True,
-        "wasm": True,
-    }
+    return deepcopy(_MOCK_MACHINE_INFO)
 
 
 @pytest.fixture()
@@ -151,12 +237,42 @@ def sample_machine_infos() -> List[Dict[str, Any]]:
     ]
 
 
+@pytest.fixture()
+def logged_in_default_handler(mock_token: str) -> Iterator[QuantinuumAPI]:
+    """The DEFAULT_API_HANDLER holding valid mock tokens, so that it can be used
+    without going through the login flow. The tokens are removed afterwards.
+    """
+    DEFAULT_API_HANDLER._cred_store.save_tokens(mock_token, mock_token)
+    yield DEFAULT_API_HANDLER
+    DEFAULT_API_HANDLER.delete_authentication()
+
+
+@pytest.fixture(scope="session")
+def bell_circ() -> Circuit:
+    return Circuit(2, name="bell_test").H(0).CX(0, 1).measure_all()
+
+
+@pytest.fixture(scope="session")
+def native_bell() -> Circuit:
+    """The Bell circuit in the Quantinuum native gate set, so that it passes the
+    circuit validation without being compiled. Up to a global phase, it prepares
+    the same state as `bell_circ`."""
+    return (
+        Circuit(2, 2, name="bell_test")
+        .PhasedX(0.5, 0, 0)
+        .PhasedX(0.5, 1, 1)
+        .ZZMax(0, 1)
+        .Measure(0, 0)
+        .PhasedX(0.5, 0.5, 1)
+        .Measure(1, 1)
+    )
+
+
 @pytest.fixture(name="mock_quum_api_handler", params=[True, False])
 def fixture_mock_quum_api_handler(
     request: SubRequest,
     requests_mock: Mocker,
     mock_credentials: Tuple[str, str],
-    mock_token: str,
 ) -> QuantinuumAPI:
     """A logged-in QuantinuumQAPI fixture.
     After using this fixture in a test, call:
@@ -166,16 +282,8 @@ def fixture_mock_quum_api_handler(
 
     username, pwd = mock_credentials
 
-    mock_url = "https://qapi.quantinuum.com/v1/login"
-
     requests_mock.register_uri(
-        "POST",
-        mock_url,
-        json={
-            "id-token": mock_token,
-            "refresh-token": mock_token,
-        },
-        headers={"Content-Type": "application/json"},
+        "POST", LOGIN_URL, json=_MOCKED_ROUTES["login"].body, headers=JSON_HDR
     )
 
     cred_store = MemoryCredentialStorage()
@@ -195,6 +303,87 @@ def fixture_mock_quum_api_handler(
     return api_handler
 
 
+@pytest.fixture(scope="module")
+def shared_mocker() -> Iterator[SimpleNamespace]:
+    """A Mocker serving the Quantinuum API routes, shared by the tests of a module.
+    Use it through the `api_routes` fixture, which resets it per test.
+
+    All the routes are served by a single matcher, which dispatches on the method
+    and path of the request, and counts and captures the calls to each route.
+
+    The scope is the module rather than the session, so that the mocked transport
+    stops with the tests using it and cannot intercept the remote tests.
+    """
+
+    def dispatch(request: requests.PreparedRequest, context: Any) -> Any:
+        name = _route_name(request)
+        if name is None:
+            context.status_code = HTTPStatus.NOT_FOUND
+            return {"error": {"text": f"No mock for {request.method} {request.url}"}}
+        getattr(routes, name).capture(request)
+        return routes.machine_infos if name == "machine" else _MOCKED_ROUTES[name].body
+
+    with Mocker() as mocker:
+        routes = SimpleNamespace(
+            mocker=mocker,
+            job_id=_MOCK_JOB_ID,
+            machine_infos=[],
+        )
+        mocker.register_uri(ANY, _QAPI_URL_PATTERN, json=dispatch, headers=JSON_HDR)
+        yield routes
+
+
+@pytest.fixture()
+def api_routes(
+    request: SubRequest,
+    shared_mocker: SimpleNamespace,
+    mock_machine_info: Dict[str, Any],
+) -> SimpleNamespace:
+    """Mock the Quantinuum API endpoints used when submitting jobs.
+
+    Returns a `CapturingRoute` for each route, so that tests can check how often
+    they were called and the JSON body of the last call.
+    The machine list contains `mock_machine_info` only, unless the fixture is
+    parametrized indirectly with the name of another fixture providing the list.
+    """
+    shared_mocker.mocker.reset_mock()
+    for name in _MOCKED_ROUTES:
+        setattr(shared_mocker, name, CapturingRoute())
+    if hasattr(request, "param"):
+        shared_mocker.machine_infos = request.getfixturevalue(request.param)
+    else:
+        shared_mocker.machine_infos = [mock_machine_info]
+    return shared_mocker
+
+
+@pytest.fixture()
+def fast_http(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """A lighter alternative to `api_routes` for tests that make many requests.
+
+    Replaces `requests.Session.send` with a lookup of pre-built responses by method
+    and path, bypassing requests_mock. The machine list is always
+    `[mock_machine_info]`. Returns a `CapturingRoute` for each route, under the
+    same names as `api_routes`.
+
+    Job status is not mocked: a request to any other endpoint raises a KeyError.
+    """
+    routes = SimpleNamespace(job_id=_MOCK_JOB_ID)
+    for name in _FAST_HTTP_RESPONSES:
+        setattr(routes, name, CapturingRoute())
+
+    def fake_send(
+        session: requests.Session, request: requests.PreparedRequest, **kwargs: Any
+    ) -> requests.Response:
+        name = _route_name(request)
+        if name not in _FAST_HTTP_RESPONSES:
+            raise KeyError(f"No mock for {request.method} {request.url}")
+        getattr(routes, name).capture(request)
+        return _FAST_HTTP_RESPONSES[name]
+
+    monkeypatch.setattr(requests.Session, "send", fake_send)
+    return routes
+
+
 @pytest.fixture(scope="module", name="authenticated_quum_handler")
 def fixture_authenticated_quum() -> QuantinuumAPI:
     # Authenticated QuantinuumAPI used for the remote tests